@@ -0,0 +1,40 @@
+"""Async token bucket used to pace outgoing OpenAI requests."""
+
+import asyncio
+import time
+
+
+class TokenBucket:
+    """Token bucket that refills continuously at a fixed per-minute rate.
+
+    Callers await `acquire()` before each request; once the bucket is empty they are
+    released one at a time as tokens refill, in arrival order.
+    """
+
+    def __init__(self, rate_per_minute: float, capacity: float | None = None) -> None:
+        """Create a bucket refilling at rate_per_minute, holding at most capacity tokens (defaults to the rate)."""
+        if rate_per_minute <= 0:
+            raise ValueError("rate_per_minute must be positive")
+
+        self.capacity = capacity if capacity is not None else rate_per_minute
+        self._rate_per_second = rate_per_minute / 60.0
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self._rate_per_second)
+        self._updated = now
+
+    async def acquire(self, tokens: float = 1.0) -> None:
+        """Wait until tokens are available, then consume them."""
+        if tokens > self.capacity:
+            raise ValueError(f"Cannot acquire {tokens} tokens from a bucket with capacity {self.capacity}")
+
+        async with self._lock:
+            self._refill()
+            while self._tokens < tokens:
+                await asyncio.sleep((tokens - self._tokens) / self._rate_per_second)
+                self._refill()
+            self._tokens -= tokens
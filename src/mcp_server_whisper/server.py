@@ -2,14 +2,22 @@
 
 import asyncio
 import base64
+import errno
+import logging
+import math
 import os
 import re
+import shutil
+import stat
+import tempfile
 import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
 from enum import Enum
-from functools import lru_cache
-from io import BytesIO
+from operator import attrgetter
 from pathlib import Path
-from typing import Any, Literal, Optional, cast
+from typing import Any, AsyncIterator, Awaitable, Callable, Iterator, Literal, Optional, cast
 
 import aiofiles
 from mcp.server.fastmcp import FastMCP
@@ -20,6 +28,11 @@ from openai.types.chat import ChatCompletionContentPartParam, ChatCompletionMess
 from pydantic import BaseModel, Field
 from pydub import AudioSegment  # type: ignore
 
+from .rate_limit import TokenBucket
+from .transcript_cache import file_sha256, get_cached, make_cache_key, put_cached
+
+logger = logging.getLogger(__name__)
+
 # Literals for transcription
 SupportedChatWithAudioFormat = Literal["mp3", "wav"]
 AudioChatModel = Literal[
@@ -41,6 +54,20 @@ TRANSCRIBE_AUDIO_FORMATS = {
     ".webm",
 }
 CHAT_WITH_AUDIO_FORMATS = {".mp3", ".wav"}
+# Every extension any model accepts, for rejecting non-audio files with a single lookup
+ALL_AUDIO_FORMATS = frozenset(TRANSCRIBE_AUDIO_FORMATS | CHAT_WITH_AUDIO_FORMATS)
+
+# Target of compress_mp3_file; ffmpeg's mp3 encoder produces about 32 kbps at this sample rate
+COMPRESSED_SAMPLE_RATE = 11025
+COMPRESSED_MP3_BITRATE = 32_000
+
+# Overlap between consecutive segments of a chunked transcription, so words on a seam are heard whole
+CHUNK_OVERLAP_SECONDS = 2
+# Formats whose output is plain text and can therefore be stitched across segments
+CHUNKABLE_RESPONSE_FORMATS = {"text", "json"}
+
+# Read size for streamed base64 encoding; a multiple of 3 so chunks encode without padding
+B64_CHUNK_SIZE = 3 * 21 * 1024
 
 # Enhancement prompts
 ENHANCEMENT_PROMPTS: dict[EnhancementType, str] = {
@@ -142,6 +169,13 @@ class TranscribeAudioInputParams(TranscribeAudioInputParamsBase):
 
         The model will try to match the style and formatting of your prompt.""",
     )
+    chunk_seconds: int | None = Field(
+        default=None,
+        ge=30,
+        description="Optional segment length in seconds for long recordings. When set, audio longer than this "
+        "is split into slightly overlapping segments that are transcribed in parallel and stitched back together. "
+        "Only supported with `text` and `json` response formats.",
+    )
 
 
 class ChatWithAudioInputParams(BaseInputPath):
@@ -164,8 +198,11 @@ class TranscribeWithEnhancementInputParams(TranscribeAudioInputParamsBase):
     )
 
     def to_transcribe_audio_input_params(self) -> TranscribeAudioInputParams:
-        """Transfer audio with LLM using custom prompt."""
-        return TranscribeAudioInputParams(
+        """Transfer audio with LLM using custom prompt.
+
+        Every field was already validated on this model, so construction skips validation.
+        """
+        return TranscribeAudioInputParams.model_construct(
             input_file_path=self.input_file_path,
             prompt=ENHANCEMENT_PROMPTS[self.enhancement_type],
             model=self.model,
@@ -219,7 +256,59 @@ class FilePathSupportParams(BaseModel):
         default=None, description="Duration of the audio file in seconds, if available"
     )
 
-    model_config = {"arbitrary_types_allowed": True}
+    # Frozen because instances are shared between callers through the file support cache
+    model_config = {"arbitrary_types_allowed": True, "frozen": True, "extra": "forbid"}
+
+
+# Limits for batch fan-out: without them a large batch opens one OpenAI request and
+# one ffmpeg process per input at once
+MAX_CONCURRENT_OPENAI_REQUESTS = 10
+MAX_CONCURRENT_FFMPEG_JOBS = os.cpu_count() or 4
+OPENAI_REQUESTS_PER_MINUTE = 60
+OPENAI_MAX_RETRIES = 3
+
+_openai_semaphore = asyncio.Semaphore(MAX_CONCURRENT_OPENAI_REQUESTS)
+_ffmpeg_semaphore = asyncio.Semaphore(MAX_CONCURRENT_FFMPEG_JOBS)
+_openai_rate_limiter = TokenBucket(OPENAI_REQUESTS_PER_MINUTE)
+
+# Dedicated pool for hashing and base64-encoding input files, so batch prep runs on every core
+# without competing with the default executor used for ordinary file I/O. hashlib releases the
+# GIL while hashing, and a process pool would cost more to ship encoded payloads back than it saves.
+_file_prep_executor = ThreadPoolExecutor(max_workers=os.cpu_count() or 4, thread_name_prefix="whisper-file-prep")
+
+# Requests currently in progress, keyed by transcript cache key
+_inflight_requests: dict[str, asyncio.Future[dict[str, Any]]] = {}
+
+_client: AsyncOpenAI | None = None
+
+
+def _get_client() -> AsyncOpenAI:
+    """Return the shared OpenAI client, creating it on first use.
+
+    Reusing one client lets parallel requests share its keep-alive connection pool
+    instead of paying a new TCP + TLS handshake per file.
+    """
+    global _client
+    if _client is None:
+        # The SDK retries 429s and transient errors itself with exponential backoff
+        _client = AsyncOpenAI(max_retries=OPENAI_MAX_RETRIES)
+    return _client
+
+
+@asynccontextmanager
+async def _openai_request_slot() -> AsyncIterator[None]:
+    """Bound concurrent OpenAI requests and pace them under the requests-per-minute budget."""
+    async with _openai_semaphore:
+        await _openai_rate_limiter.acquire()
+        yield
+
+
+async def _close_client() -> None:
+    """Close the shared OpenAI client, if one was created."""
+    global _client
+    if _client is not None:
+        await _client.close()
+        _client = None
 
 
 mcp = FastMCP("whisper", dependencies=["openai", "pydub", "aiofiles"])
@@ -237,10 +326,28 @@ def check_and_get_audio_path() -> Path:
     return audio_path
 
 
-async def get_audio_file_support(file_path: Path) -> FilePathSupportParams:
+def _stat_regular_file(file_path: Path) -> os.stat_result:
+    """Stat file_path, raising FileNotFoundError unless it is an existing regular file.
+
+    A single stat call covers both the existence and the file type check.
+    """
+    try:
+        file_stats = file_path.stat()
+    except OSError as e:
+        # A path under a regular file (ENOTDIR) or a symlink loop (ELOOP) doesn't exist either
+        if e.errno not in (errno.ENOENT, errno.ENOTDIR, errno.ELOOP):
+            raise
+        raise FileNotFoundError(f"File not found: {file_path}") from e
+    if not stat.S_ISREG(file_stats.st_mode):
+        raise FileNotFoundError(f"File not found: {file_path}")
+    return file_stats
+
+
+async def get_audio_file_support(file_path: Path, file_stats: os.stat_result | None = None) -> FilePathSupportParams:
     """Determine audio transcription file format support and metadata.
 
     Includes file size, format, and duration information where available.
+    Pass file_stats when already known (e.g. from a directory scan) to skip another stat call.
     """
     file_ext = file_path.suffix.lower()
 
@@ -254,12 +361,9 @@ async def get_audio_file_support(file_path: Path) -> FilePathSupportParams:
     )
 
     # Get file stats
-    file_stats = file_path.stat()
-
-    # Get file size using aiofiles
-    async with aiofiles.open(file_path, "rb") as f:
-        file_content = await f.read()
-    size_bytes = len(file_content)
+    if file_stats is None:
+        file_stats = file_path.stat()
+    size_bytes = file_stats.st_size
 
     # Get audio format (remove the dot from extension)
     audio_format = file_ext[1:] if file_ext.startswith(".") else file_ext
@@ -268,14 +372,16 @@ async def get_audio_file_support(file_path: Path) -> FilePathSupportParams:
     duration_seconds = None
     try:
         # Load just the metadata to get duration
-        audio = await asyncio.to_thread(AudioSegment.from_file, str(file_path), format=audio_format)
+        async with _ffmpeg_semaphore:
+            audio = await asyncio.to_thread(AudioSegment.from_file, str(file_path), format=audio_format)
         # Convert from milliseconds to seconds
         duration_seconds = len(audio) / 1000.0
     except Exception:
         # If we can't get duration, just continue without it
         pass
 
-    return FilePathSupportParams(
+    # Every value is derived from the file system above, so skip re-validating it
+    return FilePathSupportParams.model_construct(
         file_path=file_path,
         transcription_support=transcription_support,
         chat_support=chat_support,
@@ -286,6 +392,21 @@ async def get_audio_file_support(file_path: Path) -> FilePathSupportParams:
     )
 
 
+def _scan_audio_files(audio_path: Path) -> Iterator[tuple[Path, os.stat_result]]:
+    """Yield supported audio files in audio_path together with their stat results.
+
+    Uses a single os.scandir pass: DirEntry.is_file() is answered from the directory listing
+    and DirEntry.stat() is cached, so each file costs at most one stat syscall.
+    """
+    with os.scandir(audio_path) as entries:
+        for entry in entries:
+            if not entry.is_file():
+                continue
+
+            if os.path.splitext(entry.name)[1].lower() in ALL_AUDIO_FORMATS:
+                yield Path(entry.path), entry.stat()
+
+
 @mcp.tool(
     description="Get the most recent audio file from the audio path. "
     "ONLY USE THIS IF THE USER ASKS FOR THE LATEST FILE."
@@ -302,32 +423,41 @@ async def get_latest_audio() -> FilePathSupportParams:
     audio_path = check_and_get_audio_path()
 
     try:
-        files = []
-        for file_path in audio_path.iterdir():
-            if not file_path.is_file():
-                continue
-
-            file_ext = file_path.suffix.lower()
-            if file_ext in TRANSCRIBE_AUDIO_FORMATS or file_ext in CHAT_WITH_AUDIO_FORMATS:
-                files.append((file_path, file_path.stat().st_mtime))
+        # Keep only the newest entry while scanning rather than collecting every file
+        latest: tuple[Path, os.stat_result] | None = None
+        for file_path, file_stats in _scan_audio_files(audio_path):
+            if latest is None or file_stats.st_mtime > latest[1].st_mtime:
+                latest = (file_path, file_stats)
 
-        if not files:
+        if latest is None:
             raise RuntimeError("No supported audio files found")
 
-        latest_file = max(files, key=lambda x: x[1])[0]
-        return await get_audio_file_support(latest_file)
+        return await get_audio_file_support(*latest)
 
     except Exception as e:
         raise RuntimeError(f"Failed to get latest audio file: {e}") from e
 
 
-@lru_cache(maxsize=32)
-async def _get_cached_audio_file_support(file_path: str, _mtime: float) -> FilePathSupportParams:
-    """Cache audio file support information using path and mtime as key.
+_AUDIO_FILE_SUPPORT_CACHE_SIZE = 1024
+_audio_file_support_cache: OrderedDict[tuple[str, float, int], FilePathSupportParams] = OrderedDict()
 
-    Uses the file path and modified time as cache key.
+
+async def _get_cached_audio_file_support(file_path: Path, file_stats: os.stat_result) -> FilePathSupportParams:
+    """Cache audio file support information in an LRU keyed by path, mtime and size.
+
+    Results are cached rather than coroutines, which can only be awaited once.
     """
-    return await get_audio_file_support(Path(file_path))
+    key = (str(file_path), file_stats.st_mtime, file_stats.st_size)
+    cached = _audio_file_support_cache.get(key)
+    if cached is not None:
+        _audio_file_support_cache.move_to_end(key)
+        return cached
+
+    file_info = await get_audio_file_support(file_path, file_stats)
+    _audio_file_support_cache[key] = file_info
+    if len(_audio_file_support_cache) > _AUDIO_FILE_SUPPORT_CACHE_SIZE:
+        _audio_file_support_cache.popitem(last=False)
+    return file_info
 
 
 class SortBy(str, Enum):
@@ -393,34 +523,31 @@ async def list_audio_files(inputs: list[ListAudioFilesInputParams]) -> list[list
 
         try:
             # Store file paths that match our criteria
-            file_paths = []
+            cache_tasks = []
 
-            # First, collect all valid file paths
-            for file_path in audio_path.iterdir():
-                if not file_path.is_file():
+            # First, collect all valid file paths along with their stats from a single directory scan
+            for file_path, file_stats in _scan_audio_files(audio_path):
+                # Apply regex pattern filtering if provided
+                if input_data.pattern and not re.search(input_data.pattern, str(file_path)):
                     continue
 
-                file_ext = file_path.suffix.lower()
-                if file_ext in TRANSCRIBE_AUDIO_FORMATS or file_ext in CHAT_WITH_AUDIO_FORMATS:
-                    # Apply regex pattern filtering if provided
-                    if input_data.pattern and not re.search(input_data.pattern, str(file_path)):
-                        continue
-
-                    # Apply format filtering if provided
-                    if input_data.format and file_ext[1:].lower() != input_data.format.lower():
-                        continue
+                # Apply format filtering if provided
+                if input_data.format and file_path.suffix[1:].lower() != input_data.format.lower():
+                    continue
 
-                    # For other filters, we need file metadata, so add to initial list
-                    file_paths.append(file_path)
+                # Apply size and modification time filters from the scan's stats, before paying
+                # for the full metadata (which decodes the audio to measure its duration)
+                if input_data.min_size_bytes is not None and file_stats.st_size < input_data.min_size_bytes:
+                    continue
+                if input_data.max_size_bytes is not None and file_stats.st_size > input_data.max_size_bytes:
+                    continue
+                if input_data.min_modified_time is not None and file_stats.st_mtime < input_data.min_modified_time:
+                    continue
+                if input_data.max_modified_time is not None and file_stats.st_mtime > input_data.max_modified_time:
+                    continue
 
-            # Process all files in parallel with async gather
-            # We pass both the path and modification time to the cache function
-            cache_tasks = []
-            for path in file_paths:
-                # Convert Path to string for caching purposes
-                path_str = str(path)
-                mtime = path.stat().st_mtime
-                cache_tasks.append(_get_cached_audio_file_support(path_str, mtime))
+                # Duration filters need file metadata; the stats double as the cache key
+                cache_tasks.append(_get_cached_audio_file_support(file_path, file_stats))
 
             # Gather all the results
             file_support_results = await asyncio.gather(*cache_tasks)
@@ -428,12 +555,6 @@ async def list_audio_files(inputs: list[ListAudioFilesInputParams]) -> list[list
             # Apply post-metadata filters
             filtered_results = []
             for file_info in file_support_results:
-                # Apply size filters
-                if input_data.min_size_bytes is not None and file_info.size_bytes < input_data.min_size_bytes:
-                    continue
-                if input_data.max_size_bytes is not None and file_info.size_bytes > input_data.max_size_bytes:
-                    continue
-
                 # Apply duration filters if duration is available
                 if file_info.duration_seconds is not None:
                     if (
@@ -448,12 +569,6 @@ async def list_audio_files(inputs: list[ListAudioFilesInputParams]) -> list[list
                         continue
                 # Skip duration filtering if duration info isn't available
 
-                # Apply modification time filters
-                if input_data.min_modified_time is not None and file_info.modified_time < input_data.min_modified_time:
-                    continue
-                if input_data.max_modified_time is not None and file_info.modified_time > input_data.max_modified_time:
-                    continue
-
                 # If it passed all filters, add to results
                 filtered_results.append(file_info)
 
@@ -461,7 +576,7 @@ async def list_audio_files(inputs: list[ListAudioFilesInputParams]) -> list[list
             if input_data.sort_by == SortBy.NAME:
                 return sorted(filtered_results, key=lambda x: str(x.file_path), reverse=input_data.reverse)
             elif input_data.sort_by == SortBy.SIZE:
-                return sorted(filtered_results, key=lambda x: x.size_bytes, reverse=input_data.reverse)
+                return sorted(filtered_results, key=attrgetter("size_bytes"), reverse=input_data.reverse)
             elif input_data.sort_by == SortBy.DURATION:
                 # Use 0 for files with no duration to keep them at the beginning
                 return sorted(
@@ -470,9 +585,9 @@ async def list_audio_files(inputs: list[ListAudioFilesInputParams]) -> list[list
                     reverse=input_data.reverse,
                 )
             elif input_data.sort_by == SortBy.MODIFIED_TIME:
-                return sorted(filtered_results, key=lambda x: x.modified_time, reverse=input_data.reverse)
+                return sorted(filtered_results, key=attrgetter("modified_time"), reverse=input_data.reverse)
             elif input_data.sort_by == SortBy.FORMAT:
-                return sorted(filtered_results, key=lambda x: x.format, reverse=input_data.reverse)
+                return sorted(filtered_results, key=attrgetter("format"), reverse=input_data.reverse)
             else:
                 # Default to sorting by name
                 return sorted(filtered_results, key=lambda x: str(x.file_path), reverse=input_data.reverse)
@@ -483,12 +598,94 @@ async def list_audio_files(inputs: list[ListAudioFilesInputParams]) -> list[list
     return await asyncio.gather(*[process_single(input_data) for input_data in inputs])
 
 
+async def _run_ffmpeg(*args: str) -> None:
+    """Run ffmpeg with the given arguments, overwriting any existing output.
+
+    ffmpeg streams the audio itself, so Python never holds the decoded PCM samples.
+    Raises RuntimeError with ffmpeg's error output on failure.
+    """
+    async with _ffmpeg_semaphore:
+        # stdin is closed so ffmpeg can never consume the MCP stdio transport
+        proc = await asyncio.create_subprocess_exec(
+            "ffmpeg",
+            "-nostdin",
+            "-hide_banner",
+            "-loglevel",
+            "error",
+            "-y",
+            *args,
+            stdin=asyncio.subprocess.DEVNULL,
+            stdout=asyncio.subprocess.DEVNULL,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        try:
+            _, stderr = await proc.communicate()
+        except BaseException:
+            # Don't leave ffmpeg writing output after the caller has been cancelled
+            if proc.returncode is None:
+                proc.kill()
+                await proc.wait()
+            raise
+
+    if proc.returncode != 0:
+        raise RuntimeError(f"ffmpeg exited with code {proc.returncode}: {stderr.decode(errors='replace').strip()}")
+
+
+async def _run_ffprobe(*args: str) -> str:
+    """Run ffprobe with plain value output and return its trimmed stdout.
+
+    Raises RuntimeError with ffprobe's error output on failure.
+    """
+    proc = await asyncio.create_subprocess_exec(
+        "ffprobe",
+        "-v",
+        "error",
+        "-of",
+        "default=noprint_wrappers=1:nokey=1",
+        *args,
+        stdin=asyncio.subprocess.DEVNULL,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+    )
+    stdout, stderr = await proc.communicate()
+
+    if proc.returncode != 0:
+        raise RuntimeError(f"ffprobe exited with code {proc.returncode}: {stderr.decode(errors='replace').strip()}")
+    return stdout.decode(errors="replace").strip()
+
+
+async def _probe_bitrate(file_path: Path) -> int | None:
+    """Return the bitrate of the first audio stream in bits per second, or None if it can't be determined."""
+    try:
+        output = await _run_ffprobe("-select_streams", "a:0", "-show_entries", "stream=bit_rate", str(file_path))
+        return int(output)
+    except (OSError, RuntimeError, ValueError):
+        # ffprobe missing or no stream bitrate reported ("N/A"); fall back to compressing
+        return None
+
+
+async def _transcode(input_file: Path, output_path: Path, *args: str) -> None:
+    """Run ffmpeg on input_file with the given output options, writing the result to output_path.
+
+    ffmpeg truncates its output before reading the input, so the result goes to a temporary
+    file in the destination directory and is moved into place, which lets output_path be input_file.
+    """
+    fd, tmp_name = tempfile.mkstemp(dir=output_path.parent, prefix=f".{output_path.stem}.", suffix=output_path.suffix)
+    os.close(fd)
+    try:
+        await _run_ffmpeg("-i", str(input_file), *args, tmp_name)
+        os.replace(tmp_name, output_path)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+
+
 async def convert_to_supported_format(
     input_file: Path,
     output_path: Path | None = None,
     target_format: SupportedChatWithAudioFormat = "mp3",
 ) -> Path:
-    """Async version of audio file conversion using pydub.
+    """Async audio file conversion using a single ffmpeg pass.
 
     Ensures the output filename is base + .{target_format} if no output_path provided.
     """
@@ -496,19 +693,7 @@ async def convert_to_supported_format(
         output_path = input_file.with_suffix(f".{target_format}")
 
     try:
-        # Load audio file directly from path instead of reading bytes first
-        audio = await asyncio.to_thread(
-            AudioSegment.from_file,
-            str(input_file),  # pydub expects a string path
-            format=input_file.suffix[1:],  # remove the leading dot
-        )
-
-        await asyncio.to_thread(
-            audio.export,
-            str(output_path),  # pydub expects a string path
-            format=target_format,
-            parameters=["-ac", "2"],
-        )
+        await _transcode(input_file, output_path, "-ac", "2", "-f", target_format)
         return output_path
     except Exception as e:
         raise RuntimeError(f"Audio conversion failed: {str(e)}")
@@ -525,58 +710,67 @@ async def compress_mp3_file(mp3_file_path: Path, output_path: Path | None = None
     if output_path is None:
         output_path = mp3_file_path.parent / f"compressed_{mp3_file_path.stem}.mp3"
 
-    print(f"\n[Compression] Original file: {mp3_file_path}")
-    print(f"[Compression] Output file:   {output_path}")
+    logger.info("[Compression] Converting %s to %s Hz, output file: %s", mp3_file_path, out_sample_rate, output_path)
 
     try:
-        # Load audio file directly from path instead of reading bytes first
-        audio_file = await asyncio.to_thread(AudioSegment.from_file, str(mp3_file_path), format="mp3")
-        original_frame_rate = audio_file.frame_rate
-        print(f"[Compression] Original frame rate: {original_frame_rate}, converting to {out_sample_rate}.")
-        await asyncio.to_thread(
-            audio_file.export,
-            str(output_path),
-            format="mp3",
-            parameters=["-ar", str(out_sample_rate)],
-        )
+        await _transcode(mp3_file_path, output_path, "-ar", str(out_sample_rate), "-f", "mp3")
         return output_path
     except Exception as e:
         raise RuntimeError(f"Error compressing mp3 file: {str(e)}")
 
 
+async def _convert_and_compress(
+    input_file: Path, output_path: Path | None = None, out_sample_rate: int = 11025
+) -> Path:
+    """Convert any supported audio file to a downsampled stereo mp3 in a single ffmpeg pass.
+
+    Equivalent to convert_to_supported_format followed by compress_mp3_file, but decodes and
+    encodes once. If no output_path provided, returns a file named 'compressed_{original_stem}.mp3'.
+    """
+    if output_path is None:
+        output_path = input_file.parent / f"compressed_{input_file.stem}.mp3"
+
+    logger.info("[Compression] Converting %s to %s Hz mp3, output file: %s", input_file, out_sample_rate, output_path)
+    await _transcode(input_file, output_path, "-ac", "2", "-ar", str(out_sample_rate), "-f", "mp3")
+    return output_path
+
+
 async def maybe_compress_file(input_file: Path, output_path: Path | None = None, max_mb: int = 25) -> Path:
     """Compress file if is above {max_mb} and convert to mp3 if needed.
 
     If no output_path provided, returns the compressed_{stem}.mp3 path if compression happens,
     otherwise returns the original path.
     """
-    # Use aiofiles to read file size asynchronously
-    async with aiofiles.open(input_file, "rb") as f:
-        file_size = len(await f.read())
+    file_size = input_file.stat().st_size
     threshold_bytes = max_mb * 1024 * 1024
 
     if file_size <= threshold_bytes:
         return input_file  # No compression needed
 
-    print(f"\n[maybe_compress_file] File '{input_file}' size > {max_mb}MB. Attempting compression...")
+    # Downsampling a file that is already at or below the bitrate it would produce gains nothing
+    current_bitrate = await _probe_bitrate(input_file)
+    if current_bitrate is not None and current_bitrate <= COMPRESSED_MP3_BITRATE * 1.1:
+        logger.info(
+            "[maybe_compress_file] File '%s' is already %s bps. Skipping compression.", input_file, current_bitrate
+        )
+        return input_file
 
-    # If not mp3, convert
+    logger.info("[maybe_compress_file] File '%s' size > %sMB. Attempting compression...", input_file, max_mb)
+
+    # If not mp3, convert and downsample in one ffmpeg pass instead of writing an intermediate mp3
     if input_file.suffix.lower() != ".mp3":
         try:
-            input_file = await convert_to_supported_format(input_file, None, "mp3")
+            compressed_path = await _convert_and_compress(input_file, output_path, COMPRESSED_SAMPLE_RATE)
         except Exception as e:
-            raise RuntimeError(f"[maybe_compress_file] Error converting to MP3: {str(e)}")
-
-    # now downsample
-    try:
-        compressed_path = await compress_mp3_file(input_file, output_path, 11025)
-    except Exception as e:
-        raise RuntimeError(f"[maybe_compress_file] Error compressing MP3 file: {str(e)}")
+            raise RuntimeError(f"[maybe_compress_file] Error converting to compressed MP3: {str(e)}")
+    else:
+        try:
+            compressed_path = await compress_mp3_file(input_file, output_path, COMPRESSED_SAMPLE_RATE)
+        except Exception as e:
+            raise RuntimeError(f"[maybe_compress_file] Error compressing MP3 file: {str(e)}")
 
-    # Use aiofiles to read compressed file size asynchronously
-    async with aiofiles.open(compressed_path, "rb") as f:
-        new_size = len(await f.read())
-    print(f"[maybe_compress_file] Compressed file size: {new_size} bytes")
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("[maybe_compress_file] Compressed file size: %s bytes", compressed_path.stat().st_size)
     return compressed_path
 
 
@@ -615,6 +809,108 @@ async def compress_audio(inputs: list[CompressAudioInputParams]) -> list[dict[st
     return await asyncio.gather(*[process_single(input_data) for input_data in inputs])
 
 
+async def _probe_duration(file_path: Path) -> float:
+    """Return the duration of an audio file in seconds using ffprobe."""
+    output = await _run_ffprobe("-show_entries", "format=duration", str(file_path))
+    try:
+        return float(output)
+    except ValueError as e:
+        raise RuntimeError(f"Could not determine duration of {file_path}: {output!r}") from e
+
+
+async def _transcribe_file(file_path: Path, transcriptions_create_input: dict[str, Any]) -> dict[str, Any]:
+    """Send a single file to the transcription API and return the result as a dict."""
+    client = _get_client()
+
+    # Take the request slot before opening the file, so inputs queued behind the concurrency
+    # and rate limits don't each hold an open file descriptor while they wait
+    async with _openai_request_slot():
+        # Pass an open handle with its filename so the HTTP client streams the upload
+        # instead of buffering the whole file in memory first
+        audio_file = await asyncio.to_thread(open, file_path, "rb")
+        try:
+            transcript = await client.audio.transcriptions.create(
+                file=(file_path.name, audio_file), **transcriptions_create_input
+            )
+        finally:
+            audio_file.close()
+
+    if isinstance(transcript, BaseModel):
+        return transcript.model_dump()
+    return {"text": transcript}
+
+
+def _normalize_word(word: str) -> str:
+    """Lowercase a word and strip punctuation so seam comparisons ignore formatting."""
+    return re.sub(r"[^\w']", "", word).lower()
+
+
+def _stitch_transcripts(texts: list[str], max_overlap_words: int = 20) -> str:
+    """Join transcripts of overlapping segments, dropping words repeated across each seam.
+
+    The longest run of words (ignoring case and punctuation) that ends one segment and starts
+    the next is treated as the overlap and kept only once.
+    """
+    words: list[str] = []
+    for text in texts:
+        next_words = text.split()
+        max_k = min(len(words), len(next_words), max_overlap_words)
+        for k in range(max_k, 0, -1):
+            if [_normalize_word(w) for w in words[-k:]] == [_normalize_word(w) for w in next_words[:k]]:
+                next_words = next_words[k:]
+                break
+        words.extend(next_words)
+    return " ".join(words)
+
+
+async def _transcribe_chunked(
+    file_path: Path,
+    transcriptions_create_input: dict[str, Any],
+    chunk_seconds: int,
+    overlap_seconds: int = CHUNK_OVERLAP_SECONDS,
+) -> dict[str, Any]:
+    """Transcribe a long file as overlapping segments in parallel and stitch the text back together.
+
+    Segments are cut with ffmpeg stream copy (no re-encode). Files no longer than chunk_seconds
+    are sent as a single request. Either way only the text is returned, so the result has the
+    same shape regardless of the audio's length.
+    """
+    duration = await _probe_duration(file_path)
+    if duration <= chunk_seconds:
+        result = await _transcribe_file(file_path, transcriptions_create_input)
+        return {"text": result["text"]}
+
+    # ffmpeg has no muxer registered for .mpga, which is plain MPEG audio
+    chunk_suffix = ".mp3" if file_path.suffix.lower() == ".mpga" else file_path.suffix
+    num_chunks = math.ceil(duration / chunk_seconds)
+    temp_dir = Path(tempfile.mkdtemp())
+
+    async def transcribe_chunk(chunk_index: int) -> str:
+        start = max(0, chunk_index * chunk_seconds - overlap_seconds)
+        end = (chunk_index + 1) * chunk_seconds
+        chunk_path = temp_dir / f"chunk_{chunk_index}{chunk_suffix}"
+        await _run_ffmpeg(
+            "-ss", str(start), "-t", str(end - start), "-i", str(file_path), "-vn", "-c", "copy", str(chunk_path)
+        )
+        result = await _transcribe_file(chunk_path, transcriptions_create_input)
+        return str(result["text"])
+
+    tasks = [asyncio.ensure_future(transcribe_chunk(i)) for i in range(num_chunks)]
+    try:
+        texts = await asyncio.gather(*tasks)
+    except BaseException:
+        # gather() doesn't cancel the other segments when one fails; stop them so no further
+        # segments are cut or uploaded, and wait until they have finished before removing their files
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+    return {"text": _stitch_transcripts(texts)}
+
+
 @mcp.tool(
     description="A tool used to transcribe audio files. It is recommended to use `gpt-4o-mini-transcribe` by default. "
     "If the user wants maximum performance, use `gpt-4o-transcribe`. "
@@ -629,28 +925,32 @@ async def transcribe_audio(inputs: list[TranscribeAudioInputParams]) -> list[dic
 
     async def process_single(input_data: TranscribeAudioInputParams) -> dict[str, Any]:
         file_path = input_data.input_file_path
-        if not file_path.exists() or not file_path.is_file():
-            raise FileNotFoundError(f"File not found: {file_path}")
+        _stat_regular_file(file_path)
 
-        client = AsyncOpenAI()
+        if input_data.chunk_seconds is not None and input_data.response_format not in CHUNKABLE_RESPONSE_FORMATS:
+            raise ValueError(
+                f"chunk_seconds requires response_format 'text' or 'json', got '{input_data.response_format}'"
+            )
 
         try:
-            # Use aiofiles to read the audio file asynchronously
-            async with aiofiles.open(file_path, "rb") as audio_file:
-                file_content = await audio_file.read()
-
-            # Create a file-like object from bytes for OpenAI API
-
-            file_obj = BytesIO(file_content)
-            file_obj.name = file_path.name  # OpenAI API needs a filename
             transcriptions_create_input = {
-                k: v for k, v in input_data.model_dump(exclude_none=True).items() if k != "input_file_path"
+                k: v
+                for k, v in input_data.model_dump(exclude_none=True).items()
+                if k not in ["input_file_path", "chunk_seconds"]
             }
 
-            transcript = await client.audio.transcriptions.create(file=file_obj, **transcriptions_create_input)
-            if isinstance(transcript, BaseModel):
-                return transcript.model_dump()
-            return {"text": transcript}
+            # Skip the API round-trip entirely if this exact request has been transcribed before
+            file_digest = await _run_file_prep(file_sha256, file_path)
+            cache_key = make_cache_key(
+                file_digest, chunk_seconds=input_data.chunk_seconds, **transcriptions_create_input
+            )
+
+            async def request_transcription() -> dict[str, Any]:
+                if input_data.chunk_seconds is not None:
+                    return await _transcribe_chunked(file_path, transcriptions_create_input, input_data.chunk_seconds)
+                return await _transcribe_file(file_path, transcriptions_create_input)
+
+            return await _run_cached(cache_key, input_data.model, request_transcription)
 
         except Exception as e:
             raise RuntimeError(f"Whisper processing failed for {file_path}: {e}") from e
@@ -658,6 +958,57 @@ async def transcribe_audio(inputs: list[TranscribeAudioInputParams]) -> list[dic
     return await asyncio.gather(*[process_single(input_data) for input_data in inputs])
 
 
+async def _run_cached(cache_key: str, model: str, request: Callable[[], Awaitable[dict[str, Any]]]) -> dict[str, Any]:
+    """Return the cached result for cache_key, or run request and cache what it returns.
+
+    Concurrent calls with the same key share one in-flight task, so identical requests
+    from several clients cost a single API call. The task is shielded: a caller that is
+    cancelled stops waiting without cancelling the work the other callers depend on.
+    """
+    task = _inflight_requests.get(cache_key)
+    if task is None:
+        task = asyncio.ensure_future(_lookup_or_request(cache_key, model, request))
+        _inflight_requests[cache_key] = task
+
+        def forget(done: asyncio.Future[dict[str, Any]]) -> None:
+            if _inflight_requests.get(cache_key) is done:
+                del _inflight_requests[cache_key]
+
+        task.add_done_callback(forget)
+    return await asyncio.shield(task)
+
+
+async def _lookup_or_request(
+    cache_key: str, model: str, request: Callable[[], Awaitable[dict[str, Any]]]
+) -> dict[str, Any]:
+    """Return the on-disk cached result for cache_key, or run request and store its result."""
+    cached = await get_cached(cache_key)
+    if cached is not None:
+        return cached
+
+    result = await request()
+    await put_cached(cache_key, model, result)
+    return result
+
+
+async def _run_file_prep(func: Callable[[Path], str], file_path: Path) -> str:
+    """Run a CPU-bound file preparation step (hashing, encoding) on the file prep pool."""
+    return await asyncio.get_running_loop().run_in_executor(_file_prep_executor, func, file_path)
+
+
+def _encode_file_b64(file_path: Path) -> str:
+    """Base64-encode a file in chunks.
+
+    Only one raw chunk and the growing encoded buffer are resident at a time, rather than
+    the full file bytes, their encoding, and a decoded copy all at once.
+    """
+    encoded = bytearray()
+    with open(file_path, "rb") as f:
+        while chunk := f.read(B64_CHUNK_SIZE):
+            encoded += base64.b64encode(chunk)
+    return encoded.decode("ascii")
+
+
 @mcp.tool(description="A tool used to chat with audio files. The response will be a response to the audio file sent.")
 async def chat_with_audio(
     inputs: list[ChatWithAudioInputParams],
@@ -666,45 +1017,62 @@ async def chat_with_audio(
 
     async def process_single(input_data: ChatWithAudioInputParams) -> dict[str, Any]:
         file_path = input_data.input_file_path
-        if not file_path.exists() or not file_path.is_file():
-            raise FileNotFoundError(f"File not found: {file_path}")
+        _stat_regular_file(file_path)
 
-        ext = file_path.suffix.lower().replace(".", "")
-        assert ext in ["mp3", "wav"], f"Expected mp3 or wav extension, but got {ext}"
+        file_ext = file_path.suffix.lower()
+        # An explicit raise rather than assert, so the check survives `python -O`
+        if file_ext not in CHAT_WITH_AUDIO_FORMATS:
+            raise ValueError(f"Expected mp3 or wav extension, but got {file_ext[1:]}")
+        ext = file_ext[1:]
 
         try:
-            # Use aiofiles to read the audio file asynchronously
-            async with aiofiles.open(file_path, "rb") as audio_file:
-                audio_bytes = await audio_file.read()
-            audio_b64 = base64.b64encode(audio_bytes).decode("utf-8")
+            file_digest = await _run_file_prep(file_sha256, file_path)
         except Exception as e:
             raise RuntimeError(f"Failed reading audio file '{file_path}': {e}") from e
 
-        client = AsyncOpenAI()
-        messages: list[ChatCompletionMessageParam] = []
-        if input_data.system_prompt:
-            messages.append({"role": "system", "content": input_data.system_prompt})
-
-        user_content: list[ChatCompletionContentPartParam] = []
-        if input_data.user_prompt:
-            user_content.append({"type": "text", "text": input_data.user_prompt})
-        user_content.append(
-            {
-                "type": "input_audio",
-                "input_audio": {"data": audio_b64, "format": cast(Literal["wav", "mp3"], ext)},
-            }
+        cache_key = make_cache_key(
+            file_digest,
+            input_data.model,
+            input_data.user_prompt,
+            system_prompt=input_data.system_prompt,
         )
-        messages.append({"role": "user", "content": user_content})
 
-        try:
-            completion = await client.chat.completions.create(
-                model=input_data.model,
-                messages=messages,
-                modalities=["text"],
-            )
-            return {"text": completion.choices[0].message.content}
-        except Exception as e:
-            raise RuntimeError(f"GPT-4 processing failed for {input_data.input_file_path}: {e}") from e
+        async def request_completion() -> dict[str, Any]:
+            # Encode inside the request slot, so requests queued behind the concurrency and
+            # rate limits don't each hold their full base64 payload in memory while they wait
+            async with _openai_request_slot():
+                try:
+                    audio_b64 = await _run_file_prep(_encode_file_b64, file_path)
+                except Exception as e:
+                    raise RuntimeError(f"Failed reading audio file '{file_path}': {e}") from e
+
+                client = _get_client()
+                messages: list[ChatCompletionMessageParam] = []
+                if input_data.system_prompt:
+                    messages.append({"role": "system", "content": input_data.system_prompt})
+
+                user_content: list[ChatCompletionContentPartParam] = []
+                if input_data.user_prompt:
+                    user_content.append({"type": "text", "text": input_data.user_prompt})
+                user_content.append(
+                    {
+                        "type": "input_audio",
+                        "input_audio": {"data": audio_b64, "format": cast(Literal["wav", "mp3"], ext)},
+                    }
+                )
+                messages.append({"role": "user", "content": user_content})
+
+                try:
+                    completion = await client.chat.completions.create(
+                        model=input_data.model,
+                        messages=messages,
+                        modalities=["text"],
+                    )
+                    return {"text": completion.choices[0].message.content}
+                except Exception as e:
+                    raise RuntimeError(f"GPT-4 processing failed for {input_data.input_file_path}: {e}") from e
+
+        return await _run_cached(cache_key, input_data.model, request_completion)
 
     return await asyncio.gather(*[process_single(input_data) for input_data in inputs])
 
@@ -818,7 +1186,7 @@ async def create_claudecast(
             # Ensure parent directory exists
             output_path.parent.mkdir(parents=True, exist_ok=True)
 
-            client = AsyncOpenAI()
+            client = _get_client()
 
             # Split text if it exceeds the API limit (with buffer)
             text_chunks = split_text_for_tts(input_data.text_prompt)
@@ -831,28 +1199,27 @@ async def create_claudecast(
 
             if len(text_chunks) == 1:
                 # For single chunk, process directly
-                response = await client.audio.speech.create(input=text_chunks[0], **speech_create_input)
+                async with _openai_request_slot():
+                    response = await client.audio.speech.create(input=text_chunks[0], **speech_create_input)
 
-                # Stream to file using aiofiles for async IO
-                audio_bytes = await response.aread()
+                    # Stream to file using aiofiles for async IO
+                    audio_bytes = await response.aread()
                 async with aiofiles.open(output_path, "wb") as file:
                     await file.write(audio_bytes)
 
             else:
                 # For multiple chunks, process in parallel and concatenate
-                print(f"Text exceeds TTS API limit, splitting into {len(text_chunks)} chunks")
+                logger.info("Text exceeds TTS API limit, splitting into %s chunks", len(text_chunks))
 
                 # Create temporary directory for chunk files
-                import tempfile
-
                 temp_dir = Path(tempfile.mkdtemp())
 
                 # Process each chunk in parallel
                 async def process_chunk(chunk_text: str, chunk_index: int) -> Path:
                     chunk_path = temp_dir / f"chunk_{chunk_index}.mp3"
-                    response = await client.audio.speech.create(input=chunk_text, **speech_create_input)
-
-                    audio_bytes = await response.aread()
+                    async with _openai_request_slot():
+                        response = await client.audio.speech.create(input=chunk_text, **speech_create_input)
+                        audio_bytes = await response.aread()
                     async with aiofiles.open(chunk_path, "wb") as file:
                         await file.write(audio_bytes)
 
@@ -864,11 +1231,13 @@ async def create_claudecast(
                 # Concatenate audio files using pydub
                 combined = AudioSegment.empty()
                 for chunk_path in chunk_paths:
-                    segment = await asyncio.to_thread(AudioSegment.from_mp3, str(chunk_path))
+                    async with _ffmpeg_semaphore:
+                        segment = await asyncio.to_thread(AudioSegment.from_mp3, str(chunk_path))
                     combined += segment
 
                 # Export the final combined audio
-                await asyncio.to_thread(combined.export, str(output_path), format="mp3")
+                async with _ffmpeg_semaphore:
+                    await asyncio.to_thread(combined.export, str(output_path), format="mp3")
 
                 # Clean up temporary files
                 for chunk_path in chunk_paths:
@@ -883,9 +1252,22 @@ async def create_claudecast(
     return await asyncio.gather(*[process_single(input_data) for input_data in inputs])
 
 
+async def _run_stdio_server() -> None:
+    """Serve over stdio, closing the shared OpenAI client once the server exits.
+
+    The client is shared by every session, so it is closed here at process shutdown rather than
+    in a FastMCP lifespan, which runs once per session. The close has to happen inside the
+    server's event loop, as the client's connections are bound to it.
+    """
+    try:
+        await mcp.run_stdio_async()
+    finally:
+        await _close_client()
+
+
 def main() -> None:
     """Run main entrypoint."""
-    mcp.run()
+    asyncio.run(_run_stdio_server())
 
 
 if __name__ == "__main__":
@@ -0,0 +1,93 @@
+"""On-disk cache for transcription results.
+
+Entries are keyed by the SHA-256 of the audio bytes together with the model and every request option that can
+change the output, so a hit is only ever returned for an identical request.
+"""
+
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any, Optional
+
+import aiofiles
+
+DEFAULT_CACHE_DIR = Path.home() / ".cache" / "mcp-whisper"
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def cache_enabled() -> bool:
+    """Return False when caching has been disabled with MCP_WHISPER_NO_CACHE=1."""
+    return os.getenv("MCP_WHISPER_NO_CACHE", "").strip().lower() not in {"1", "true", "yes"}
+
+
+def get_cache_dir() -> Path:
+    """Return the cache directory, honoring the MCP_WHISPER_CACHE_DIR override."""
+    cache_dir_str = os.getenv("MCP_WHISPER_CACHE_DIR")
+    return Path(cache_dir_str).expanduser() if cache_dir_str else DEFAULT_CACHE_DIR
+
+
+def file_sha256(file_path: Path) -> str:
+    """Return the hex SHA-256 digest of a file, reading it in chunks to bound memory use."""
+    hasher = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        while chunk := f.read(HASH_CHUNK_SIZE):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+def make_cache_key(file_digest: str, model: str, prompt: Optional[str] = None, **options: Any) -> str:
+    """Build the cache key for a transcription request.
+
+    Args:
+    ----
+        file_digest: Hex SHA-256 digest of the audio file contents
+        model: Model used for the request
+        prompt: Prompt sent alongside the audio, if any
+        **options: Any further request options that affect the output (e.g. response_format)
+
+    Returns:
+    -------
+        Hex SHA-256 digest identifying the request
+
+    """
+    hasher = hashlib.sha256(file_digest.encode("ascii"))
+    hasher.update(b"\0" + model.encode("utf-8"))
+    hasher.update(b"\0" + (prompt or "").encode("utf-8"))
+    hasher.update(b"\0" + json.dumps(options, sort_keys=True, default=str).encode("utf-8"))
+    return hasher.hexdigest()
+
+
+async def get_cached(key: str) -> Optional[dict[str, Any]]:
+    """Return the cached result for key, or None on a miss or unreadable entry."""
+    if not cache_enabled():
+        return None
+
+    try:
+        async with aiofiles.open(get_cache_dir() / f"{key}.json", encoding="utf-8") as f:
+            entry = json.loads(await f.read())
+        result = entry["result"]
+    except Exception:
+        # Missing or corrupt entries degrade to a normal transcription
+        return None
+
+    return result if isinstance(result, dict) else None
+
+
+async def put_cached(key: str, model: str, result: dict[str, Any]) -> None:
+    """Store a transcription result under key. Failures to write are ignored."""
+    if not cache_enabled():
+        return
+
+    cache_dir = get_cache_dir()
+    cache_path = cache_dir / f"{key}.json"
+    tmp_path = cache_dir / f"{key}.{os.getpid()}.tmp"
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        async with aiofiles.open(tmp_path, "w", encoding="utf-8") as f:
+            await f.write(json.dumps({"result": result, "model": model, "mtime": time.time()}))
+        # Atomic rename so concurrent readers never observe a partial entry
+        os.replace(tmp_path, cache_path)
+    except Exception:
+        tmp_path.unlink(missing_ok=True)
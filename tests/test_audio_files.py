@@ -1,10 +1,15 @@
 """Test audio file listing and filtering capabilities."""
 
+from pathlib import Path
+from typing import List, Tuple
+
 import pytest
 
 from mcp_server_whisper.server import (
     ListAudioFilesInputParams,
     SortBy,
+    get_latest_audio,
+    list_audio_files,
 )
 
 
@@ -40,3 +45,27 @@ async def test_list_audio_files_input_params() -> None:
     assert params.min_modified_time == 1000000.0
     assert params.max_modified_time == 2000000.0
     assert params.format == "mp3"
+
+
+async def test_list_audio_files_repeated_calls(sample_audio_files: List[Tuple[Path, int, int]]) -> None:
+    """Test that listing returns every sample file with stat metadata and can be called repeatedly."""
+    for _ in range(2):
+        (results,) = await list_audio_files([ListAudioFilesInputParams(sort_by=SortBy.SIZE)])
+        assert [(r.file_path, r.size_bytes, r.modified_time) for r in results] == [
+            (path, size, mtime) for path, size, mtime in sample_audio_files
+        ]
+
+
+async def test_get_latest_audio(sample_audio_files: List[Tuple[Path, int, int]]) -> None:
+    """Test that the most recently modified audio file is returned."""
+    latest = await get_latest_audio()
+    assert latest.file_path == sample_audio_files[-1][0]
+    assert latest.modified_time == sample_audio_files[-1][2]
+
+
+async def test_list_audio_files_size_and_time_filters(sample_audio_files: List[Tuple[Path, int, int]]) -> None:
+    """Test that size and modification time filters select the expected files."""
+    (results,) = await list_audio_files(
+        [ListAudioFilesInputParams(min_size_bytes=1500, max_modified_time=300.0, sort_by=SortBy.MODIFIED_TIME)]
+    )
+    assert [r.file_path.name for r in results] == ["test2.wav", "test3.mp4"]
@@ -0,0 +1,32 @@
+"""Test the async token bucket rate limiter."""
+
+import time
+
+import pytest
+
+from mcp_server_whisper.rate_limit import TokenBucket
+
+
+async def test_burst_up_to_capacity_does_not_wait() -> None:
+    """Test that a full bucket serves capacity requests immediately."""
+    bucket = TokenBucket(rate_per_minute=60, capacity=5)
+    start = time.monotonic()
+    for _ in range(5):
+        await bucket.acquire()
+    assert time.monotonic() - start < 0.05
+
+
+async def test_empty_bucket_waits_for_refill() -> None:
+    """Test that an empty bucket blocks until a token refills."""
+    bucket = TokenBucket(rate_per_minute=600, capacity=1)  # one token every 0.1s
+    await bucket.acquire()
+    start = time.monotonic()
+    await bucket.acquire()
+    assert time.monotonic() - start >= 0.08
+
+
+async def test_acquire_more_than_capacity_raises() -> None:
+    """Test that requesting more tokens than the bucket can hold fails fast."""
+    bucket = TokenBucket(rate_per_minute=60, capacity=2)
+    with pytest.raises(ValueError):
+        await bucket.acquire(3)
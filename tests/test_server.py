@@ -1,6 +1,26 @@
 """Test the whisper server functionality."""
 
-from mcp_server_whisper.server import ListAudioFilesInputParams, SortBy
+import asyncio
+import base64
+import os
+from pathlib import Path
+from typing import Any
+
+import pytest
+from _pytest.monkeypatch import MonkeyPatch
+
+from mcp_server_whisper import server
+from mcp_server_whisper.server import (
+    ENHANCEMENT_PROMPTS,
+    ListAudioFilesInputParams,
+    SortBy,
+    TranscribeAudioInputParams,
+    TranscribeWithEnhancementInputParams,
+    _encode_file_b64,
+    _run_cached,
+    _stitch_transcripts,
+    _transcribe_chunked,
+)
 
 
 def test_sort_by_enum() -> None:
@@ -25,3 +45,270 @@ def test_list_audio_files_params_defaults() -> None:
     assert params.format is None
     assert params.sort_by == SortBy.NAME
     assert params.reverse is False
+
+
+def test_stitch_transcripts_drops_repeated_seam_words() -> None:
+    """Test that words repeated across an overlap seam are kept only once."""
+    texts = ["Hello there, my friend. How are", "how are you doing today? I am", "I am fine."]
+    assert _stitch_transcripts(texts) == "Hello there, my friend. How are you doing today? I am fine."
+
+
+def test_stitch_transcripts_without_overlap() -> None:
+    """Test that segments with no shared words are simply joined."""
+    assert _stitch_transcripts(["first part", "second part"]) == "first part second part"
+    assert _stitch_transcripts(["only segment"]) == "only segment"
+
+
+def test_enhancement_params_conversion() -> None:
+    """Test that enhancement params map onto transcription params with the matching prompt."""
+    params = TranscribeWithEnhancementInputParams(
+        input_file_path=Path("audio.mp3"), enhancement_type="professional", model="whisper-1"
+    ).to_transcribe_audio_input_params()
+    assert isinstance(params, TranscribeAudioInputParams)
+    assert params.input_file_path == Path("audio.mp3")
+    assert params.model == "whisper-1"
+    assert params.prompt == ENHANCEMENT_PROMPTS["professional"]
+    assert params.response_format == "text"
+    assert params.chunk_seconds is None
+
+
+async def test_run_cached_collapses_concurrent_requests(monkeypatch: MonkeyPatch) -> None:
+    """Test that concurrent requests with the same key share a single in-flight call."""
+    monkeypatch.setenv("MCP_WHISPER_NO_CACHE", "1")
+    calls = 0
+
+    async def request() -> dict[str, Any]:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return {"text": "hello"}
+
+    results = await asyncio.gather(*[_run_cached("key", "whisper-1", request) for _ in range(3)])
+    assert results == [{"text": "hello"}] * 3
+    assert calls == 1
+
+    # Once finished, the key is released and a new call runs the request again
+    await _run_cached("key", "whisper-1", request)
+    assert calls == 2
+
+
+class FakeChunkPipeline:
+    """Stand-ins for the ffprobe, ffmpeg and API calls made by _transcribe_chunked."""
+
+    def __init__(self, monkeypatch: MonkeyPatch, duration: float, fail_on_chunk: int | None = None) -> None:
+        """Patch the server module so chunked transcription runs without ffmpeg or network access."""
+        self.ffmpeg_calls: list[tuple[str, ...]] = []
+        self.transcribed: list[Path] = []
+        self.fail_on_chunk = fail_on_chunk
+
+        async def probe_duration(file_path: Path) -> float:
+            return duration
+
+        monkeypatch.setattr(server, "_probe_duration", probe_duration)
+        monkeypatch.setattr(server, "_run_ffmpeg", self.run_ffmpeg)
+        monkeypatch.setattr(server, "_transcribe_file", self.transcribe_file)
+
+    async def run_ffmpeg(self, *args: str) -> None:
+        """Record the ffmpeg arguments and create the output file."""
+        self.ffmpeg_calls.append(args)
+        Path(args[-1]).write_bytes(b"chunk")
+
+    async def transcribe_file(self, file_path: Path, transcriptions_create_input: dict[str, Any]) -> dict[str, Any]:
+        """Return canned text, checking that segments still exist when they are uploaded."""
+        if file_path.stem.startswith("chunk_"):
+            assert file_path.exists()
+        self.transcribed.append(file_path)
+        if self.fail_on_chunk is not None and file_path.stem == f"chunk_{self.fail_on_chunk}":
+            raise RuntimeError("API failure")
+        return {"text": f"part {file_path.stem}", "logprobs": None, "usage": {"seconds": 1}}
+
+
+async def test_transcribe_chunked_windows_and_cleanup(monkeypatch: MonkeyPatch) -> None:
+    """Test that long audio is cut into overlapping windows and the temp directory is removed."""
+    fake = FakeChunkPipeline(monkeypatch, duration=70.0)
+
+    result = await _transcribe_chunked(Path("/audio/talk.mpga"), {"model": "whisper-1"}, chunk_seconds=30)
+
+    assert result == {"text": "part chunk_0 part chunk_1 part chunk_2"}
+    windows = sorted((args[args.index("-ss") + 1], args[args.index("-t") + 1]) for args in fake.ffmpeg_calls)
+    assert windows == [("0", "30"), ("28", "32"), ("58", "32")]
+    assert all(args[args.index("-i") + 1] == "/audio/talk.mpga" for args in fake.ffmpeg_calls)
+    assert {path.suffix for path in fake.transcribed} == {".mp3"}
+    assert not fake.transcribed[0].parent.exists()
+
+
+async def test_transcribe_chunked_cleans_up_on_failure(monkeypatch: MonkeyPatch) -> None:
+    """Test that the temp directory is removed even when a segment fails to transcribe."""
+    fake = FakeChunkPipeline(monkeypatch, duration=70.0, fail_on_chunk=1)
+
+    with pytest.raises(RuntimeError, match="API failure"):
+        await _transcribe_chunked(Path("/audio/talk.mp3"), {"model": "whisper-1"}, chunk_seconds=30)
+
+    assert fake.transcribed
+    assert not fake.transcribed[0].parent.exists()
+
+
+async def test_transcribe_chunked_short_audio_returns_text_only(monkeypatch: MonkeyPatch) -> None:
+    """Test that audio shorter than one chunk is sent whole but returns the same result shape."""
+    fake = FakeChunkPipeline(monkeypatch, duration=20.0)
+
+    result = await _transcribe_chunked(Path("/audio/talk.mp3"), {"model": "whisper-1"}, chunk_seconds=30)
+
+    assert result == {"text": "part talk"}
+    assert fake.ffmpeg_calls == []
+    assert fake.transcribed == [Path("/audio/talk.mp3")]
+
+
+@pytest.mark.parametrize(
+    ("ffprobe_output", "expect_compression"),
+    [
+        ("16000", False),  # already below the compressed bitrate
+        ("128000", True),
+        ("N/A", True),  # container doesn't report a stream bitrate
+        (RuntimeError("ffprobe exited with code 1"), True),
+    ],
+)
+async def test_maybe_compress_file_bitrate_skip(
+    monkeypatch: MonkeyPatch, tmp_path: Path, ffprobe_output: str | Exception, expect_compression: bool
+) -> None:
+    """Test that only files already at a low bitrate skip compression; probe failures still compress."""
+    input_file = tmp_path / "large.mp3"
+    input_file.write_bytes(b"0" * (2 * 1024 * 1024))
+    compressed_file = tmp_path / "compressed_large.mp3"
+    compress_calls: list[Path] = []
+
+    async def run_ffprobe(*args: str) -> str:
+        if isinstance(ffprobe_output, Exception):
+            raise ffprobe_output
+        return ffprobe_output
+
+    async def compress_mp3_file(mp3_file_path: Path, output_path: Path | None = None, out_sample_rate: int = 0) -> Path:
+        compress_calls.append(mp3_file_path)
+        compressed_file.write_bytes(b"0")
+        return compressed_file
+
+    monkeypatch.setattr(server, "_run_ffprobe", run_ffprobe)
+    monkeypatch.setattr(server, "compress_mp3_file", compress_mp3_file)
+
+    result = await server.maybe_compress_file(input_file, max_mb=1)
+
+    if expect_compression:
+        assert result == compressed_file
+        assert compress_calls == [input_file]
+    else:
+        assert result == input_file
+        assert compress_calls == []
+
+
+async def test_transcribe_chunked_cancels_pending_segments_on_failure(monkeypatch: MonkeyPatch) -> None:
+    """Test that when one segment fails, segments still in flight are cancelled and never uploaded."""
+    release_uploads = asyncio.Event()
+    chunk_paths: list[Path] = []
+    cancelled: list[str] = []
+    uploaded: list[str] = []
+
+    async def probe_duration(file_path: Path) -> float:
+        return 100.0
+
+    async def run_ffmpeg(*args: str) -> None:
+        await asyncio.sleep(0)
+        chunk_paths.append(Path(args[-1]))
+        Path(args[-1]).write_bytes(b"chunk")
+
+    async def transcribe_file(file_path: Path, transcriptions_create_input: dict[str, Any]) -> dict[str, Any]:
+        if file_path.stem == "chunk_0":
+            # Fail only once every sibling segment is waiting on its upload
+            while len(chunk_paths) < 4:
+                await asyncio.sleep(0)
+            raise RuntimeError("API failure")
+        try:
+            await release_uploads.wait()
+        except asyncio.CancelledError:
+            cancelled.append(file_path.stem)
+            raise
+        uploaded.append(file_path.stem)
+        return {"text": file_path.stem}
+
+    monkeypatch.setattr(server, "_probe_duration", probe_duration)
+    monkeypatch.setattr(server, "_run_ffmpeg", run_ffmpeg)
+    monkeypatch.setattr(server, "_transcribe_file", transcribe_file)
+
+    with pytest.raises(RuntimeError, match="API failure"):
+        await _transcribe_chunked(Path("/audio/talk.mp3"), {"model": "whisper-1"}, chunk_seconds=30)
+
+    # Letting the uploads proceed now must not resume any of the cancelled segments
+    release_uploads.set()
+    await asyncio.sleep(0)
+
+    assert sorted(cancelled) == ["chunk_1", "chunk_2", "chunk_3"]
+    assert uploaded == []
+    assert not chunk_paths[0].parent.exists()
+
+
+@pytest.mark.parametrize("transcode", ["convert", "compress"])
+async def test_transcode_in_place(monkeypatch: MonkeyPatch, tmp_path: Path, transcode: str) -> None:
+    """Test that converting or compressing a file onto itself reads the original and replaces it."""
+    audio_file = tmp_path / "talk.mp3"
+    audio_file.write_bytes(b"original")
+
+    async def run_ffmpeg(*args: str) -> None:
+        input_path, output_path = Path(args[args.index("-i") + 1]), Path(args[-1])
+        assert output_path != input_path
+        assert output_path.parent == input_path.parent
+        output_path.write_bytes(input_path.read_bytes() + b" transcoded")
+
+    monkeypatch.setattr(server, "_run_ffmpeg", run_ffmpeg)
+
+    if transcode == "convert":
+        result = await server.convert_to_supported_format(audio_file, audio_file, "mp3")
+    else:
+        result = await server.compress_mp3_file(audio_file, audio_file)
+
+    assert result == audio_file
+    assert audio_file.read_bytes() == b"original transcoded"
+    assert list(tmp_path.iterdir()) == [audio_file]
+
+
+async def test_transcode_failure_keeps_original(monkeypatch: MonkeyPatch, tmp_path: Path) -> None:
+    """Test that a failed in-place conversion leaves the original file and no temporary output."""
+    audio_file = tmp_path / "talk.wav"
+    audio_file.write_bytes(b"original")
+
+    async def run_ffmpeg(*args: str) -> None:
+        Path(args[-1]).write_bytes(b"partial")
+        raise RuntimeError("ffmpeg exited with code 1")
+
+    monkeypatch.setattr(server, "_run_ffmpeg", run_ffmpeg)
+
+    with pytest.raises(RuntimeError, match="Audio conversion failed"):
+        await server.convert_to_supported_format(audio_file, target_format="wav")
+
+    assert audio_file.read_bytes() == b"original"
+    assert list(tmp_path.iterdir()) == [audio_file]
+
+
+@pytest.mark.parametrize("relative_path", ["missing.mp3", "talk.mp3/inner.mp3", "loop.mp3", "folder.mp3"])
+def test_stat_regular_file_not_found(tmp_path: Path, relative_path: str) -> None:
+    """Test that paths which don't name an existing regular file all raise FileNotFoundError."""
+    (tmp_path / "talk.mp3").write_bytes(b"0")
+    (tmp_path / "loop.mp3").symlink_to(tmp_path / "loop.mp3")
+    (tmp_path / "folder.mp3").mkdir()
+
+    with pytest.raises(FileNotFoundError, match="File not found"):
+        server._stat_regular_file(tmp_path / relative_path)
+
+    assert server._stat_regular_file(tmp_path / "talk.mp3").st_size == 1
+
+
+@pytest.mark.parametrize("size", [0, 1, 2, 3, 64511, 64512, 64513])
+def test_encode_file_b64_round_trip(tmp_path: Path, size: int) -> None:
+    """Test that chunked encoding matches encoding the whole file at once, around the chunk boundary."""
+    assert server.B64_CHUNK_SIZE == 64512
+    data = os.urandom(size)
+    audio_file = tmp_path / "talk.mp3"
+    audio_file.write_bytes(data)
+
+    encoded = _encode_file_b64(audio_file)
+
+    assert encoded == base64.b64encode(data).decode("ascii")
+    assert base64.b64decode(encoded) == data
@@ -0,0 +1,53 @@
+"""Test the on-disk transcript cache."""
+
+from pathlib import Path
+
+import pytest
+from _pytest.monkeypatch import MonkeyPatch
+
+from mcp_server_whisper.transcript_cache import get_cached, make_cache_key, put_cached
+
+
+@pytest.fixture
+def cache_dir(monkeypatch: MonkeyPatch, tmp_path: Path) -> Path:
+    """Point the transcript cache at a temporary directory."""
+    cache_dir = tmp_path / "cache"
+    monkeypatch.setenv("MCP_WHISPER_CACHE_DIR", str(cache_dir))
+    monkeypatch.delenv("MCP_WHISPER_NO_CACHE", raising=False)
+    return cache_dir
+
+
+def test_make_cache_key_depends_on_all_inputs() -> None:
+    """Test that every request input contributes to the cache key."""
+    base = make_cache_key("abc", "whisper-1", "prompt", response_format="text")
+    assert base == make_cache_key("abc", "whisper-1", "prompt", response_format="text")
+    assert base != make_cache_key("abd", "whisper-1", "prompt", response_format="text")
+    assert base != make_cache_key("abc", "gpt-4o-transcribe", "prompt", response_format="text")
+    assert base != make_cache_key("abc", "whisper-1", None, response_format="text")
+    assert base != make_cache_key("abc", "whisper-1", "prompt", response_format="json")
+
+
+async def test_cache_round_trip(cache_dir: Path) -> None:
+    """Test that a stored result is returned on the next lookup."""
+    key = make_cache_key("abc", "whisper-1")
+    assert await get_cached(key) is None
+
+    await put_cached(key, "whisper-1", {"text": "hello"})
+    assert await get_cached(key) == {"text": "hello"}
+
+
+async def test_corrupt_entry_is_a_miss(cache_dir: Path) -> None:
+    """Test that an unreadable cache entry degrades to a cache miss."""
+    key = make_cache_key("abc", "whisper-1")
+    cache_dir.mkdir()
+    (cache_dir / f"{key}.json").write_text("{not json")
+    assert await get_cached(key) is None
+
+
+async def test_cache_can_be_disabled(cache_dir: Path, monkeypatch: MonkeyPatch) -> None:
+    """Test that MCP_WHISPER_NO_CACHE bypasses reads and writes."""
+    monkeypatch.setenv("MCP_WHISPER_NO_CACHE", "1")
+    key = make_cache_key("abc", "whisper-1")
+    await put_cached(key, "whisper-1", {"text": "hello"})
+    assert not cache_dir.exists()
+    assert await get_cached(key) is None